@@ -0,0 +1,35 @@
+"""
+Optional Numba support.
+
+Numba is not a hard dependency, and importing it costs ~100 ms, so the
+compiled kernels live in _kernels (which imports numba at the top) and are
+loaded on first use through kernels(). Callers keep a NumPy path for when
+kernels() returns None.
+"""
+
+import functools
+from importlib.util import find_spec
+from types import ModuleType
+from typing import Optional
+
+NUMBA_AVAILABLE = find_spec("numba") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def kernels() -> Optional[ModuleType]:
+    """
+    The _kernels module, imported on the first call.
+
+    Returns:
+        The module, or None if numba is not installed or fails to import
+    """
+    if not NUMBA_AVAILABLE:
+        return None
+    try:
+        from . import _kernels
+    except ImportError:  # installed but broken: use the NumPy paths
+        return None
+    return _kernels
+
+
+__all__ = ["NUMBA_AVAILABLE", "kernels"]
@@ -0,0 +1,134 @@
+"""
+Numba kernels for the hot loops in eci, metrics_internal, metrics_external
+and ngram_fast.
+
+This module imports numba at the top, so it is only imported on first use,
+through _jit.kernels(); callers fall back to their NumPy (or plain Python)
+code when that returns None.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+from .metrics_external import _has_repeated_window
+
+
+# eci.bootstrap_ci: one statistic per row of resample indices
+@njit(parallel=True, cache=True)
+def bootstrap_median(values: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Median of each bootstrap resample given by a row of indices."""
+    n_bootstrap, n = indices.shape
+    out = np.empty(n_bootstrap)
+    for b in prange(n_bootstrap):
+        resample = np.empty(n)
+        for j in range(n):
+            resample[j] = values[indices[b, j]]
+        out[b] = np.median(resample)
+    return out
+
+
+@njit(parallel=True, cache=True)
+def bootstrap_std(values: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Standard deviation of each bootstrap resample given by a row of indices."""
+    n_bootstrap, n = indices.shape
+    out = np.empty(n_bootstrap)
+    for b in prange(n_bootstrap):
+        resample = np.empty(n)
+        for j in range(n):
+            resample[j] = values[indices[b, j]]
+        out[b] = np.std(resample)
+    return out
+
+
+# metrics_internal: trajectory summaries and rank metrics
+@njit(cache=True)
+def aggregate(arr):
+    """Mean, std (Welford), min and max of a trajectory in a single pass."""
+    mean = 0.0
+    m2 = 0.0
+    lo = arr[0]
+    hi = arr[0]
+    for i in range(len(arr)):
+        v = arr[i]
+        if np.isnan(v):
+            # Match NumPy: any NaN makes every summary NaN
+            return np.nan, np.nan, np.nan, np.nan
+        delta = v - mean
+        mean += delta / (i + 1)
+        m2 += delta * (v - mean)
+        if v < lo:
+            lo = v
+        if v > hi:
+            hi = v
+    return mean, np.sqrt(m2 / len(arr)), lo, hi
+
+
+# error_model="numpy": 0/0 gives NaN (as in the NumPy path) instead of raising
+@njit(cache=True, error_model="numpy")
+def spectral_sums(sv):
+    """sum(s²) and sum(s⁴) in one pass over the singular values."""
+    s2_sum = 0.0
+    s4_sum = 0.0
+    for i in range(len(sv)):
+        s2 = sv[i] * sv[i]
+        s2_sum += s2
+        s4_sum += s2 * s2
+    return s2_sum, s4_sum
+
+
+@njit(cache=True, error_model="numpy")
+def effective_rank(sv, s2_sum):
+    """exp of the entropy of s² / sum(s²), skipping zero (and NaN) weights."""
+    H = 0.0
+    for i in range(len(sv)):
+        p = sv[i] * sv[i] / s2_sum
+        if p > 0:
+            H -= p * np.log(p)
+    return np.exp(H)
+
+
+# ngram_fast: n-gram keys and set intersection
+@njit(cache=True)
+def ngram_hashes(token_ids, n, prime):
+    """Rabin-Karp rolling version of ngram_hashes."""
+    n_ngrams = len(token_ids) - n + 1
+    out = np.empty(n_ngrams, dtype=np.uint64)
+
+    # Weight of the token leaving the window: prime ** (n - 1)
+    lead = np.uint64(1)
+    for _ in range(n - 1):
+        lead *= prime
+
+    h = np.uint64(0)
+    for k in range(n):
+        h = h * prime + np.uint64(token_ids[k])
+    out[0] = h
+
+    for i in range(1, n_ngrams):
+        h = (h - np.uint64(token_ids[i - 1]) * lead) * prime + np.uint64(
+            token_ids[i + n - 1]
+        )
+        out[i] = h
+    return out
+
+
+@njit(cache=True)
+def count_common(a, b):
+    """Merge-walk two sorted unique arrays and count shared values."""
+    i = 0
+    j = 0
+    common = 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            i += 1
+        elif a[i] > b[j]:
+            j += 1
+        else:
+            common += 1
+            i += 1
+            j += 1
+    return common
+
+
+# metrics_external.detect_repetition (runs as plain Python without numba)
+has_repeated_window = njit(cache=True)(_has_repeated_window)
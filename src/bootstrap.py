@@ -2,17 +2,16 @@
 Bootstrap confidence intervals for ROC-AUC and PR-AUC.
 """
 
-from typing import Tuple
+from typing import Callable, Optional, Sequence, Tuple
 
 import numpy as np
-from sklearn.metrics import (
-    average_precision_score,
-    precision_recall_curve,
-    roc_auc_score,
-    roc_curve,
-)
 
-from .constants import BOOTSTRAP_N_RESAMPLES, BOOTSTRAP_SEED, CI_ALPHA
+from .constants import (
+    BOOTSTRAP_BATCH_BYTES,
+    BOOTSTRAP_N_RESAMPLES,
+    BOOTSTRAP_SEED,
+    CI_ALPHA,
+)
 
 
 def bootstrap_roc_auc(
@@ -21,6 +20,7 @@ def bootstrap_roc_auc(
     n_bootstrap: int = BOOTSTRAP_N_RESAMPLES,
     seed: int = BOOTSTRAP_SEED,
     alpha: float = CI_ALPHA,
+    batch: Optional[int] = None,
 ) -> Tuple[float, float, float]:
     """
     Compute ROC-AUC with bootstrap confidence interval.
@@ -31,47 +31,32 @@ def bootstrap_roc_auc(
         n_bootstrap: Number of bootstrap resamples
         seed: Random seed
         alpha: Significance level (default 0.05 for 95% CI)
+        batch: Resamples evaluated at once; None sizes batches so their
+            working memory stays within BOOTSTRAP_BATCH_BYTES
 
     Returns:
         Tuple of (auc, lower_ci, upper_ci)
     """
-    if len(y_true) == 0 or len(set(y_true)) < 2:
-        return (0.5, 0.5, 0.5)
-
-    # Compute base AUC
     try:
-        base_auc = roc_auc_score(y_true, y_score)
+        y_true, y_score = _as_binary_inputs(y_true, y_score)
     except ValueError:
         return (0.5, 0.5, 0.5)
 
-    # Bootstrap
-    rng = np.random.RandomState(seed)
-    bootstrap_aucs = []
-
-    for _ in range(n_bootstrap):
-        # Resample with replacement
-        indices = rng.choice(len(y_true), size=len(y_true), replace=True)
-        y_true_boot = y_true[indices]
-        y_score_boot = y_score[indices]
-
-        # Skip if only one class in bootstrap sample
-        if len(set(y_true_boot)) < 2:
-            continue
-
-        try:
-            auc_boot = roc_auc_score(y_true_boot, y_score_boot)
-            bootstrap_aucs.append(auc_boot)
-        except ValueError:
-            continue
+    if not _has_both_classes(y_true):
+        return (0.5, 0.5, 0.5)
 
-    if not bootstrap_aucs:
-        return (base_auc, base_auc, base_auc)
+    # Compute base AUC
+    if not np.isfinite(y_score).all():
+        return (0.5, 0.5, 0.5)
+    base_auc = _fast_binary_auc(y_true, y_score)
 
-    # Compute percentile CI
-    lower = np.percentile(bootstrap_aucs, alpha / 2 * 100)
-    upper = np.percentile(bootstrap_aucs, (1 - alpha / 2) * 100)
+    # Bootstrap: every resample is scored against the same tie groups of
+    # y_score, so all AUCs come out of one vectorized rank-sum computation.
+    (bootstrap_aucs,) = _bootstrap_from_counts(
+        y_true, y_score, (_auc_from_counts,), n_bootstrap, seed, batch
+    )
 
-    return (float(base_auc), float(lower), float(upper))
+    return _percentile_ci(base_auc, bootstrap_aucs, alpha)
 
 
 def bootstrap_pr_auc(
@@ -80,6 +65,7 @@ def bootstrap_pr_auc(
     n_bootstrap: int = BOOTSTRAP_N_RESAMPLES,
     seed: int = BOOTSTRAP_SEED,
     alpha: float = CI_ALPHA,
+    batch: Optional[int] = None,
 ) -> Tuple[float, float, float]:
     """
     Compute PR-AUC (Average Precision) with bootstrap confidence interval.
@@ -90,15 +76,25 @@ def bootstrap_pr_auc(
         n_bootstrap: Number of bootstrap resamples
         seed: Random seed
         alpha: Significance level
+        batch: Resamples evaluated at once; None sizes batches so their
+            working memory stays within BOOTSTRAP_BATCH_BYTES
 
     Returns:
         Tuple of (ap, lower_ci, upper_ci)
     """
-    if len(y_true) == 0 or len(set(y_true)) < 2:
+    try:
+        y_true, y_score = _as_binary_inputs(y_true, y_score)
+    except ValueError:
+        prevalence = np.mean(y_true)
+        return (prevalence, prevalence, prevalence)
+
+    if not _has_both_classes(y_true):
         prevalence = np.mean(y_true) if len(y_true) > 0 else 0.5
         return (prevalence, prevalence, prevalence)
 
     # Compute base Average Precision
+    from sklearn.metrics import average_precision_score
+
     try:
         base_ap = average_precision_score(y_true, y_score)
     except ValueError:
@@ -106,30 +102,71 @@ def bootstrap_pr_auc(
         return (prevalence, prevalence, prevalence)
 
     # Bootstrap
-    rng = np.random.RandomState(seed)
-    bootstrap_aps = []
+    (bootstrap_aps,) = _bootstrap_from_counts(
+        y_true, y_score, (_average_precision_from_counts,), n_bootstrap, seed, batch
+    )
+
+    return _percentile_ci(base_ap, bootstrap_aps, alpha)
+
+
+def bootstrap_roc_pr_auc(
+    y_true: np.ndarray,
+    y_score: np.ndarray,
+    n_bootstrap: int = BOOTSTRAP_N_RESAMPLES,
+    seed: int = BOOTSTRAP_SEED,
+    alpha: float = CI_ALPHA,
+    batch: Optional[int] = None,
+) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
+    """
+    Compute ROC-AUC and PR-AUC with bootstrap confidence intervals in one pass.
 
-    for _ in range(n_bootstrap):
-        indices = rng.choice(len(y_true), size=len(y_true), replace=True)
-        y_true_boot = y_true[indices]
-        y_score_boot = y_score[indices]
+    Gives the same result as calling bootstrap_roc_auc and bootstrap_pr_auc
+    with the same arguments, but the resamples are drawn and reduced once
+    and shared by both statistics.
 
-        if len(set(y_true_boot)) < 2:
-            continue
+    Args:
+        y_true: True binary labels
+        y_score: Predicted scores
+        n_bootstrap: Number of bootstrap resamples
+        seed: Random seed
+        alpha: Significance level (default 0.05 for 95% CI)
+        batch: Resamples evaluated at once; None sizes batches so their
+            working memory stays within BOOTSTRAP_BATCH_BYTES
 
-        try:
-            ap_boot = average_precision_score(y_true_boot, y_score_boot)
-            bootstrap_aps.append(ap_boot)
-        except ValueError:
-            continue
+    Returns:
+        Tuple of ((auc, lower_ci, upper_ci), (ap, lower_ci, upper_ci))
+    """
+    try:
+        labels, scores = _as_binary_inputs(y_true, y_score)
+    except ValueError:
+        labels, scores = None, None
+
+    # Degenerate inputs never reach the bootstrap; reuse the single-metric rules
+    if labels is None or not _has_both_classes(labels) or not np.isfinite(scores).all():
+        return (
+            bootstrap_roc_auc(y_true, y_score, n_bootstrap, seed, alpha, batch),
+            bootstrap_pr_auc(y_true, y_score, n_bootstrap, seed, alpha, batch),
+        )
 
-    if not bootstrap_aps:
-        return (base_ap, base_ap, base_ap)
+    from sklearn.metrics import average_precision_score
 
-    lower = np.percentile(bootstrap_aps, alpha / 2 * 100)
-    upper = np.percentile(bootstrap_aps, (1 - alpha / 2) * 100)
+    y_true, y_score = labels, scores
+    base_auc = _fast_binary_auc(y_true, y_score)
+    base_ap = average_precision_score(y_true, y_score)
 
-    return (float(base_ap), float(lower), float(upper))
+    bootstrap_aucs, bootstrap_aps = _bootstrap_from_counts(
+        y_true,
+        y_score,
+        (_auc_from_counts, _average_precision_from_counts),
+        n_bootstrap,
+        seed,
+        batch,
+    )
+
+    return (
+        _percentile_ci(base_auc, bootstrap_aucs, alpha),
+        _percentile_ci(base_ap, bootstrap_aps, alpha),
+    )
 
 
 def compute_roc_curve_data(
@@ -145,14 +182,26 @@ def compute_roc_curve_data(
     Returns:
         Tuple of (fpr, tpr, thresholds)
     """
-    if len(y_true) == 0 or len(set(y_true)) < 2:
-        return (np.array([0, 1]), np.array([0, 1]), np.array([0, 1]))
-
     try:
-        return roc_curve(y_true, y_score)
+        y_true, y_score = _as_binary_inputs(y_true, y_score)
     except ValueError:
         return (np.array([0, 1]), np.array([0, 1]), np.array([0, 1]))
 
+    if not _has_both_classes(y_true):
+        return (np.array([0, 1]), np.array([0, 1]), np.array([0, 1]))
+
+    if not np.isfinite(y_score).all():
+        return (np.array([0, 1]), np.array([0, 1]), np.array([0, 1]))
+
+    fps, tps, thresholds = _binary_clf_curve(y_true, y_score)
+
+    # Start the curve at (0, 0), above the highest score
+    fpr = np.r_[0, fps] / fps[-1]
+    tpr = np.r_[0, tps] / tps[-1]
+    thresholds = np.r_[np.inf, thresholds]
+
+    return (fpr, tpr, thresholds)
+
 
 def compute_pr_curve_data(
     y_true: np.ndarray, y_score: np.ndarray
@@ -167,10 +216,18 @@ def compute_pr_curve_data(
     Returns:
         Tuple of (precision, recall, thresholds)
     """
-    if len(y_true) == 0 or len(set(y_true)) < 2:
+    try:
+        y_true, y_score = _as_binary_inputs(y_true, y_score)
+    except ValueError:
+        prevalence = np.mean(y_true)
+        return (np.array([prevalence, prevalence]), np.array([0, 1]), np.array([0]))
+
+    if not _has_both_classes(y_true):
         prevalence = np.mean(y_true) if len(y_true) > 0 else 0.5
         return (np.array([prevalence, prevalence]), np.array([0, 1]), np.array([0]))
 
+    from sklearn.metrics import precision_recall_curve
+
     try:
         return precision_recall_curve(y_true, y_score)
     except ValueError:
@@ -195,20 +252,315 @@ def compute_calibration(
     if len(y_true) == 0:
         return (np.array([]), np.array([]))
 
+    # Labels are averaged as given, so soft labels work too
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+
     # Bin predictions
     bin_edges = np.linspace(0, 1, n_bins + 1)
     bin_indices = np.digitize(y_prob, bin_edges[:-1]) - 1
     bin_indices = np.clip(bin_indices, 0, n_bins - 1)
 
-    mean_predicted = np.zeros(n_bins)
-    fraction_positive = np.zeros(n_bins)
+    # Per-bin sums and counts in one pass each
+    counts = np.bincount(bin_indices, minlength=n_bins)
+    sum_prob = np.bincount(bin_indices, weights=y_prob, minlength=n_bins)
+    sum_true = np.bincount(bin_indices, weights=y_true, minlength=n_bins)
+
+    # Keep every non-empty bin, including bins whose mean prediction is 0
+    valid_bins = counts > 0
+    mean_predicted = sum_prob[valid_bins] / counts[valid_bins]
+    fraction_positive = sum_true[valid_bins] / counts[valid_bins]
+
+    return (mean_predicted, fraction_positive)
+
+
+def _has_both_classes(y_true: np.ndarray) -> bool:
+    """Check that 0/1 labels (see _as_binary_inputs) contain both classes."""
+    n_pos = np.count_nonzero(y_true)
+    return 0 < n_pos < len(y_true)
+
+
+def _as_binary_inputs(
+    y_true: np.ndarray, y_score: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Binarize labels and cast both inputs to the contiguous dtypes used internally.
+
+    As in sklearn, two-valued labels (e.g. {0, 1}, {-1, 1}, booleans) take
+    the greater value as the positive class; a single label value is positive
+    only if it equals 1. Labels become 0/1 int8. Scores stay float64 because
+    narrowing them could merge distinct scores into ties and change the AUC.
+
+    Args:
+        y_true: True binary labels
+        y_score: Predicted scores
+
+    Returns:
+        Tuple of (y_true as 0/1 int8, y_score as float64)
+
+    Raises:
+        ValueError: If y_true has more than two distinct values
+    """
+    labels = np.asarray(y_true)
+    scores = np.ascontiguousarray(y_score, dtype=np.float64)
+
+    if labels.size == 0:
+        return np.zeros(0, dtype=np.int8), scores
+
+    lo, hi = labels.min(), labels.max()
+    if lo != hi and np.any((labels != lo) & (labels != hi)):
+        raise ValueError(
+            "y_true must hold binary labels; found more than two distinct values"
+        )
+
+    positive = labels == hi if lo != hi else labels == 1
+    return positive.astype(np.int8), scores
+
+
+def _binary_clf_curve(
+    y_true: np.ndarray, y_score: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count false and true positives at each distinct score threshold.
+
+    Minimal binary counterpart of sklearn's internal _binary_clf_curve: inputs
+    are assumed to be validated, finite, and one-dimensional.
+
+    Args:
+        y_true: True binary labels
+        y_score: Predicted scores
+
+    Returns:
+        Tuple of (fps, tps, thresholds), thresholds in decreasing order
+    """
+    order = np.argsort(-y_score, kind="mergesort")
+    y_score = y_score[order]
+    y_true = y_true[order]
+
+    # Last index of each run of tied scores
+    threshold_idxs = np.r_[np.flatnonzero(np.diff(y_score)), len(y_score) - 1]
+
+    tps = np.cumsum(y_true)[threshold_idxs]
+    fps = threshold_idxs + 1 - tps
+
+    return fps, tps, y_score[threshold_idxs]
+
+
+def _fast_binary_auc(y_true: np.ndarray, y_score: np.ndarray) -> float:
+    """
+    Compute ROC-AUC by trapezoidal integration over the distinct thresholds.
+
+    Args:
+        y_true: True binary labels (both classes present)
+        y_score: Predicted scores
+
+    Returns:
+        ROC-AUC
+    """
+    fps, tps, _ = _binary_clf_curve(y_true, y_score)
+    fps = np.r_[0, fps]
+    tps = np.r_[0, tps]
+
+    area = np.sum(np.diff(fps) * (tps[1:] + tps[:-1])) / 2
+    return float(area / (fps[-1] * tps[-1]))
+
+
+def _sort_by_score(
+    y_true: np.ndarray, y_score: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Order labels by ascending score and locate the score tie groups.
+
+    Args:
+        y_true: True binary labels
+        y_score: Predicted scores
+
+    Returns:
+        Tuple of (labels sorted by score, start offset of each tie group)
+    """
+    order = np.argsort(y_score, kind="stable")
+    sorted_scores = y_score[order]
+    group_starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+    return y_true[order], group_starts
+
+
+def _bootstrap_from_counts(
+    y_true: np.ndarray,
+    y_score: np.ndarray,
+    stats_from_counts: Sequence[Callable[[np.ndarray, np.ndarray], np.ndarray]],
+    n_bootstrap: int,
+    seed: int,
+    batch: Optional[int] = None,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Evaluate count-based statistics over shared bootstrap resamples in batches.
+
+    Only one batch of resamples is alive at a time, so peak memory is
+    O(batch * n) regardless of n_bootstrap. Every statistic sees the same
+    resamples, which are drawn and reduced once.
+
+    Args:
+        y_true: True binary labels
+        y_score: Predicted scores
+        stats_from_counts: Functions mapping (pos_counts, neg_counts) to one
+            value per resample, NaN where the resample is degenerate
+        n_bootstrap: Number of bootstrap resamples
+        seed: Random seed
+        batch: Resamples per batch; None sizes batches so their whole working
+            set fits in BOOTSTRAP_BATCH_BYTES
+
+    Returns:
+        Tuple with, per statistic, its values on every non-degenerate resample
+    """
+    y_sorted, group_starts = _sort_by_score(y_true, y_score)
+    cells = _class_group_cells(y_sorted, group_starts)
+    if batch is None:
+        # Per resample: int64 drawn positions and their cells (16 bytes per
+        # value), then about eight int64/float64 arrays per score group for
+        # the counts and the statistics' cumulative sums and temporaries
+        bytes_per_resample = 16 * len(y_sorted) + 64 * len(group_starts)
+        batch = max(1, BOOTSTRAP_BATCH_BYTES // bytes_per_resample)
+
+    rng = np.random.default_rng(seed)
+    out = np.empty((len(stats_from_counts), n_bootstrap))
+    for start in range(0, n_bootstrap, batch):
+        stop = min(start + batch, n_bootstrap)
+        pos_counts, neg_counts = _bootstrap_class_counts(
+            cells, len(group_starts), stop - start, rng
+        )
+        for row, stat_from_counts in zip(out, stats_from_counts):
+            row[start:stop] = stat_from_counts(pos_counts, neg_counts)
+
+    return tuple(row[~np.isnan(row)] for row in out)
+
+
+def _percentile_ci(
+    estimate: float, bootstrap_stats: np.ndarray, alpha: float
+) -> Tuple[float, float, float]:
+    """
+    Attach a percentile confidence interval to a point estimate.
+
+    Args:
+        estimate: Statistic on the full sample
+        bootstrap_stats: Statistic on each bootstrap resample
+        alpha: Significance level
+
+    Returns:
+        Tuple of (estimate, lower_ci, upper_ci); a zero-width interval if
+        there are no bootstrap values
+    """
+    if len(bootstrap_stats) == 0:
+        return (estimate, estimate, estimate)
+
+    # Both bounds from a single sort
+    lower, upper = np.quantile(bootstrap_stats, [alpha / 2, 1 - alpha / 2])
+
+    return (float(estimate), float(lower), float(upper))
+
+
+def _bootstrap_class_counts(
+    cells: np.ndarray,
+    n_groups: int,
+    n_bootstrap: int,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count positives and negatives per score group for every bootstrap resample.
+
+    Each resample draws n positions with replacement; the (score group,
+    class) cell of every drawn position is tallied with a single bincount
+    over all resamples, offsetting each resample into its own block of
+    cells. Positions are exchangeable, so they can be drawn directly over
+    the score-sorted labels.
+
+    Args:
+        cells: Cell of each score-sorted position, 2 * group + label
+            (see _class_group_cells)
+        n_groups: Number of score tie groups
+        n_bootstrap: Number of bootstrap resamples
+        rng: NumPy random Generator
+
+    Returns:
+        Tuple of (pos_counts, neg_counts), each of shape (n_bootstrap, n_groups)
+    """
+    n = len(cells)
+    n_cells = 2 * n_groups
+
+    keys = cells[rng.integers(0, n, size=(n_bootstrap, n))]
+    keys += np.arange(0, n_bootstrap * n_cells, n_cells)[:, None]
+
+    counts = np.bincount(keys.ravel(), minlength=n_bootstrap * n_cells)
+    counts = counts.reshape(n_bootstrap, n_groups, 2)
+
+    return counts[:, :, 1], counts[:, :, 0]
+
+
+def _class_group_cells(y_sorted: np.ndarray, group_starts: np.ndarray) -> np.ndarray:
+    """
+    Map each score-sorted position to its (score group, class) cell.
+
+    Args:
+        y_sorted: True binary labels sorted by ascending score
+        group_starts: Start offset of each score tie group (see _sort_by_score)
+
+    Returns:
+        int64 array with 2 * group index + label per position
+    """
+    group_sizes = np.diff(np.r_[group_starts, len(y_sorted)])
+    groups = np.repeat(np.arange(len(group_starts)), group_sizes)
+    return 2 * groups + y_sorted
+
+
+def _auc_from_counts(pos_counts: np.ndarray, neg_counts: np.ndarray) -> np.ndarray:
+    """
+    Compute ROC-AUC per resample as a Mann-Whitney U statistic.
+
+    Each positive is credited with the number of negatives scored below it,
+    plus half the negatives tied with it (midrank convention).
+
+    Args:
+        pos_counts: Positives per ascending score group, shape (n_bootstrap, n_groups)
+        neg_counts: Negatives per ascending score group, same shape
+
+    Returns:
+        AUC per resample, NaN for resamples missing a class
+    """
+    n_pairs = pos_counts.sum(axis=1) * neg_counts.sum(axis=1)
+
+    neg_below = np.cumsum(neg_counts, axis=1) - neg_counts
+    u_stat = (pos_counts * (neg_below + 0.5 * neg_counts)).sum(axis=1)
+
+    return np.divide(
+        u_stat, n_pairs, out=np.full(len(u_stat), np.nan), where=n_pairs > 0
+    )
+
+
+def _average_precision_from_counts(
+    pos_counts: np.ndarray, neg_counts: np.ndarray
+) -> np.ndarray:
+    """
+    Compute Average Precision per resample from per-group class counts.
+
+    Matches sklearn's average_precision_score: the precision at each distinct
+    threshold is weighted by the recall gained at that threshold.
+
+    Args:
+        pos_counts: Positives per ascending score group, shape (n_bootstrap, n_groups)
+        neg_counts: Negatives per ascending score group, same shape
+
+    Returns:
+        Average Precision per resample, NaN for resamples missing a class
+    """
+    # Walk thresholds from the highest score down
+    pos_desc = pos_counts[:, ::-1]
+    tps = np.cumsum(pos_desc, axis=1)
+    fps = np.cumsum(neg_counts[:, ::-1], axis=1)
+
+    n_pos = tps[:, -1]
+    valid = (n_pos > 0) & (fps[:, -1] > 0)
 
-    for i in range(n_bins):
-        mask = bin_indices == i
-        if mask.sum() > 0:
-            mean_predicted[i] = y_prob[mask].mean()
-            fraction_positive[i] = y_true[mask].mean()
+    predicted = tps + fps
+    precision = np.divide(tps, predicted, out=np.zeros(tps.shape), where=predicted > 0)
+    ap = (pos_desc * precision).sum(axis=1)
 
-    # Filter out empty bins
-    valid_bins = mean_predicted > 0
-    return (mean_predicted[valid_bins], fraction_positive[valid_bins])
+    return np.divide(ap, n_pos, out=np.full(len(ap), np.nan), where=valid)
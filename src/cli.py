@@ -4,14 +4,13 @@ Command-line interface for reproducing figures.
 Usage:
     python -m src.cli reproduce --in runs/affordable --out runs/affordable/figures --dpi 600
     python -m src.cli reproduce --in runs/affordable --out runs/affordable/figures --dpi 300 --smoke
+    python -m src.cli reproduce --in runs/affordable --out runs/affordable/figures --format webp
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from .figures import generate_all_figures
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -44,6 +43,13 @@ def main():
     reproduce_parser.add_argument(
         "--smoke", action="store_true", help="Run smoke test with 5%% subsample"
     )
+    reproduce_parser.add_argument(
+        "--format",
+        dest="fmt",
+        choices=["png", "webp"],
+        default="png",
+        help="Output image format (default: png; webp is lossless and smaller)",
+    )
 
     # Legacy smoke command for backward compatibility
     smoke_parser = subparsers.add_parser(
@@ -74,18 +80,24 @@ def main():
         output_dir = Path(args.output_dir)
         dpi = args.dpi
         smoke = args.smoke
+        fmt = args.fmt
     else:  # legacy 'smoke' command
         run_dir = Path(args.run_dir)
         output_dir = Path(args.output_dir)
         dpi = 300
         smoke = True
+        fmt = "png"
 
     if not run_dir.exists():
         print(f"Error: Run directory not found: {run_dir}")
         sys.exit(1)
 
+    # Imported only once arguments are valid: matplotlib, scipy and sklearn
+    # take over a second to load, which --help and usage errors should not pay
+    from .figures import generate_all_figures
+
     try:
-        generate_all_figures(run_dir, output_dir, smoke=smoke, dpi=dpi)
+        generate_all_figures(run_dir, output_dir, smoke=smoke, dpi=dpi, fmt=fmt)
         print("\n✓ Success!")
         return 0
     except Exception as e:
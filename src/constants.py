@@ -53,8 +53,24 @@ EXTERNAL_COLS_REQUIRED = [
     "reasoning_failures",
 ]
 
+# Columns stored in the CSVs as string representations of lists/dicts
+INTERNAL_LIST_COLS = [
+    "effective_ranks",
+    "participation_ratios",
+    "variances",
+    "window_starts",
+    "window_ends",
+]
+EXTERNAL_LIST_COLS = ["delta_i_values", "ngram_novelty_values", "char_entropy_values"]
+EXTERNAL_DICT_COLS = ["reasoning_failures"]
+
+# Columns identifying a row in both CSVs
+MERGE_KEYS = ["prompt_id", "model_name"]
+
 # Statistical parameters
 BOOTSTRAP_N_RESAMPLES = 1000
 BOOTSTRAP_SEED = 42
+BOOTSTRAP_BATCH_BYTES = 32 * 2**20  # working memory per batch of bootstrap resamples
 CALIBRATION_N_BINS = 10
 CI_ALPHA = 0.05  # for 95% confidence intervals
+ANALYTIC_CI_MIN_N = 10_000  # sample size above which mean CIs use the normal limit
@@ -4,12 +4,17 @@ Epistemic Collapse Index (ECI) computation and analysis.
 ECI measures the rate of change in internal metrics over token generation.
 """
 
-from typing import List, Optional, Tuple
+from itertools import chain
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
-from scipy import stats
 
-from .constants import ECI_COLLAPSE_THRESHOLD
+from ._jit import kernels
+from .constants import (
+    ANALYTIC_CI_MIN_N,
+    BOOTSTRAP_BATCH_BYTES,
+    ECI_COLLAPSE_THRESHOLD,
+)
 
 
 def compute_eci_slope(
@@ -18,7 +23,7 @@ def compute_eci_slope(
     """
     Compute ECI as the slope of metric values over token generation.
 
-    Uses linear regression: metric ~ token_index
+    Uses the least-squares slope of metric ~ token_index, in closed form.
 
     Args:
         metric_values: List of metric values (e.g., effective rank) over windows
@@ -30,17 +35,82 @@ def compute_eci_slope(
     if not metric_values or len(metric_values) < 2:
         return 0.0
 
-    y = np.array(metric_values)
+    y = np.asarray(metric_values, dtype=np.float64)
+    n = len(y)
 
     if token_indices is None:
-        x = np.arange(len(y))
-    else:
-        x = np.array(token_indices[: len(y)])
+        # Evenly spaced x = 0..n-1: centered x and its sum of squares are known
+        x_centered = np.arange(n, dtype=np.float64) - (n - 1) / 2
+        return float(x_centered @ y / (n * (n * n - 1) / 12))
+
+    # Least-squares slope: cov(x, y) / var(x)
+    x = np.asarray(token_indices[:n], dtype=np.float64)
+    x_centered = x - x.mean()
+    ss_x = x_centered @ x_centered
+    if ss_x == 0:
+        return 0.0
+
+    return float(x_centered @ (y - y.mean()) / ss_x)
+
+
+def stack_trajectories(trajectories: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Stack ragged metric trajectories into a NaN-padded 2-D array.
+
+    Args:
+        trajectories: Per-sequence metric values (e.g., the effective_ranks column)
+
+    Returns:
+        Array of shape (n_sequences, max_length); row i holds trajectory i
+        followed by NaN padding
+    """
+    lengths = np.fromiter(
+        (len(t) for t in trajectories), dtype=np.int64, count=len(trajectories)
+    )
+    width = int(lengths.max(initial=0))
+
+    matrix = np.full((len(trajectories), width), np.nan)
+    mask = np.arange(width) < lengths[:, None]
+    matrix[mask] = np.fromiter(
+        chain.from_iterable(trajectories), dtype=np.float64, count=int(lengths.sum())
+    )
+
+    return matrix
+
+
+def compute_eci_slope_batch(metric_matrix: np.ndarray) -> np.ndarray:
+    """
+    Compute ECI slopes for many sequences at once.
+
+    Row-wise equivalent of compute_eci_slope with default token indices:
+    x is the column index, and NaN entries (padding) are ignored.
+
+    Args:
+        metric_matrix: Array of shape (n_sequences, n_windows), NaN-padded
+            (see stack_trajectories)
 
-    # Linear regression
-    slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+    Returns:
+        Array of n_sequences slopes; 0.0 where fewer than two values are present
+    """
+    y = np.asarray(metric_matrix, dtype=np.float64)
+    valid = ~np.isnan(y)
+    n = valid.sum(axis=1)
+    n_safe = np.maximum(n, 1)[:, None]
+
+    x = np.arange(y.shape[1], dtype=np.float64)
+    x_mean = (valid * x).sum(axis=1, keepdims=True) / n_safe
+    y_mean = np.where(valid, y, 0.0).sum(axis=1, keepdims=True) / n_safe
 
-    return float(slope)
+    x_centered = np.where(valid, x - x_mean, 0.0)
+    y_centered = np.where(valid, y - y_mean, 0.0)
+    ss_x = (x_centered * x_centered).sum(axis=1)
+
+    return np.divide(
+        (x_centered * y_centered).sum(axis=1),
+        ss_x,
+        out=np.zeros(len(y)),
+        where=ss_x > 0,
+    )
 
 
 def residualize_eci(
@@ -70,6 +140,9 @@ def classify_collapse(eci: float, threshold: float = ECI_COLLAPSE_THRESHOLD) ->
     """
     Classify whether an ECI value indicates collapse.
 
+    Scalar API. For arrays or Series, compare directly
+    (``values < ECI_COLLAPSE_THRESHOLD``) instead of applying this per element.
+
     Args:
         eci: ECI value
         threshold: Collapse threshold (default -0.02)
@@ -96,7 +169,7 @@ def compute_collapse_fraction(
     if len(eci_values) == 0:
         return 0.0
 
-    n_collapsed = np.sum(eci_values < threshold)
+    n_collapsed = np.count_nonzero(eci_values < threshold)
     return n_collapsed / len(eci_values)
 
 
@@ -119,12 +192,33 @@ def compute_eci_stats(eci_values: np.ndarray) -> dict:
             "n": 0,
         }
 
+    values = np.asarray(eci_values, dtype=np.float64).ravel()
+    n = len(values)
+
+    # Two-pass variance: summing squared deviations from the mean avoids the
+    # cancellation of E[x^2] - E[x]^2 when values sit far from zero
+    mean = values.sum() / n
+    deviations = values - mean
+    var = deviations @ deviations / n
+
+    # Median by O(n) selection instead of a full sort. partition moves NaN to
+    # the end instead of propagating it, so match np.median explicitly.
+    mid = n // 2
+    if np.isnan(mean) and np.isnan(values).any():
+        median = np.nan
+    elif n % 2:
+        median = np.partition(values, mid)[mid]
+    else:
+        median = np.partition(values, [mid - 1, mid])[mid - 1 : mid + 1].mean()
+
     return {
-        "mean": float(np.mean(eci_values)),
-        "std": float(np.std(eci_values)),
-        "median": float(np.median(eci_values)),
-        "collapse_fraction": compute_collapse_fraction(eci_values),
-        "n": len(eci_values),
+        "mean": float(mean),
+        "std": float(np.sqrt(var)),
+        "median": float(median),
+        "collapse_fraction": float(
+            np.count_nonzero(values < ECI_COLLAPSE_THRESHOLD) / n
+        ),
+        "n": n,
     }
 
 
@@ -138,6 +232,10 @@ def bootstrap_ci(
     """
     Compute bootstrap confidence interval for a statistic.
 
+    For the mean of ANALYTIC_CI_MIN_N or more values, the bootstrap
+    distribution is replaced by its normal limit N(mean, s / sqrt(n)) and
+    no resampling is done.
+
     Args:
         values: Array of values
         stat_func: Function to compute statistic (default: np.mean)
@@ -151,14 +249,79 @@ def bootstrap_ci(
     if len(values) == 0:
         return (0.0, 0.0)
 
-    rng = np.random.RandomState(seed)
-    bootstrap_stats = []
-
-    for _ in range(n_bootstrap):
-        resample = rng.choice(values, size=len(values), replace=True)
-        bootstrap_stats.append(stat_func(resample))
+    values = np.asarray(values)
+    n = len(values)
+
+    if stat_func is np.mean and n >= ANALYTIC_CI_MIN_N:
+        from scipy.stats import norm
+
+        values = values.astype(np.float64)
+        mean = values.mean()
+        half_width = norm.ppf(1 - alpha / 2) * values.std(ddof=1) / np.sqrt(n)
+        return (float(mean - half_width), float(mean + half_width))
+
+    rng = np.random.default_rng(seed)
+
+    if stat_func is np.mean:
+        # Gather a batch of resamples and average each row; int32 indices plus
+        # the float64 gather make 12 bytes per drawn value
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        bootstrap_stats = np.empty(n_bootstrap)
+        for start, indices in _bootstrap_index_batches(
+            rng, n, n_bootstrap, bytes_per_index=12
+        ):
+            bootstrap_stats[start : start + len(indices)] = values[indices].mean(axis=1)
+    elif stat_func in _NJIT_STAT_KERNELS and kernels() is not None:
+        # Same index stream as the loop below, evaluated in parallel one
+        # bounded batch of resamples at a time
+        kernel = getattr(kernels(), _NJIT_STAT_KERNELS[stat_func])
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        bootstrap_stats = np.empty(n_bootstrap)
+        for start, indices in _bootstrap_index_batches(rng, n, n_bootstrap):
+            bootstrap_stats[start : start + len(indices)] = kernel(values, indices)
+    else:
+        bootstrap_stats = []
+        for _ in range(n_bootstrap):
+            resample = values[rng.integers(0, n, size=n, dtype=np.int32)]
+            bootstrap_stats.append(stat_func(resample))
 
-    lower = np.percentile(bootstrap_stats, alpha / 2 * 100)
-    upper = np.percentile(bootstrap_stats, (1 - alpha / 2) * 100)
+    # Both bounds from a single sort
+    lower, upper = np.quantile(bootstrap_stats, [alpha / 2, 1 - alpha / 2])
 
     return (float(lower), float(upper))
+
+
+def _bootstrap_index_batches(
+    rng: np.random.Generator, n: int, n_bootstrap: int, bytes_per_index: int = 4
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Draw bootstrap resample indices in batches of rows.
+
+    Each batch holds at most BOOTSTRAP_BATCH_BYTES, counting bytes_per_index
+    per drawn index, so memory stays bounded as n grows. Rows are drawn in
+    order from rng, which yields the same indices as one
+    rng.integers(0, n, size=n) call per resample.
+
+    Args:
+        rng: NumPy random Generator
+        n: Number of values to resample
+        n_bootstrap: Number of bootstrap resamples
+        bytes_per_index: Memory the caller holds per index (4 for the int32
+            indices alone; more if each batch is also gathered)
+
+    Yields:
+        Tuples of (index of the batch's first resample, int32 indices of
+        shape (batch, n))
+    """
+    batch = max(1, BOOTSTRAP_BATCH_BYTES // (bytes_per_index * n))
+    for start in range(0, n_bootstrap, batch):
+        size = min(batch, n_bootstrap - start)
+        yield start, rng.integers(0, n, size=(size, n), dtype=np.int32)
+
+
+# Statistics with a compiled bootstrap kernel in _kernels (used when numba
+# is installed)
+_NJIT_STAT_KERNELS = {
+    np.median: "bootstrap_median",
+    np.std: "bootstrap_std",
+}
@@ -9,26 +9,29 @@ This module generates all three figures from the paper:
 
 from pathlib import Path
 
+import matplotlib
 import matplotlib.gridspec as gridspec
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from matplotlib.collections import LineCollection
+from scipy.special import expit
 
 from .bootstrap import (
-    bootstrap_pr_auc,
-    bootstrap_roc_auc,
+    bootstrap_roc_pr_auc,
     compute_calibration,
     compute_pr_curve_data,
     compute_roc_curve_data,
 )
 from .constants import CALIBRATION_N_BINS, COLORS, DEFAULT_DPI, ECI_COLLAPSE_THRESHOLD
-from .eci import classify_collapse
 
 
 def setup_matplotlib(dpi: int = None):
     """Configure matplotlib for publication-quality figures."""
     if dpi is None:
         dpi = DEFAULT_DPI
+    # Raster-only output: skip interactive backend selection entirely
+    matplotlib.use("Agg", force=True)
     plt.rcParams.update(
         {
             "font.family": "sans-serif",
@@ -52,6 +55,21 @@ def setup_matplotlib(dpi: int = None):
     )
 
 
+def save_figure(output_path: Path, dpi: int = None):
+    """
+    Save the current figure; the format follows the file suffix.
+
+    WebP output is written lossless, so it keeps PNG's pixel fidelity at a
+    smaller file size.
+    """
+    save_dpi = dpi if dpi is not None else DEFAULT_DPI
+    savefig_kwargs = {"dpi": save_dpi, "bbox_inches": "tight"}
+    # pil_kwargs is only understood by Pillow-backed raster writers
+    if Path(output_path).suffix == ".webp":
+        savefig_kwargs["pil_kwargs"] = {"lossless": True}
+    plt.savefig(output_path, **savefig_kwargs)
+
+
 def figure1_eci_histograms(
     df: pd.DataFrame, output_path: Path, bins: int = 30, dpi: int = None
 ):
@@ -124,8 +142,7 @@ def figure1_eci_histograms(
     ax.spines["right"].set_visible(False)
 
     plt.tight_layout()
-    save_dpi = dpi if dpi is not None else DEFAULT_DPI
-    plt.savefig(output_path, dpi=save_dpi, bbox_inches="tight")
+    save_figure(output_path, dpi)
     plt.close()
 
     print(f"Figure 1 saved to {output_path}")
@@ -149,10 +166,10 @@ def figure2_effective_rank_trajectories(
 
     # Classify sequences
     df = df.copy()
-    df["collapsed"] = df["eci_residualized"].apply(classify_collapse)
+    df["collapsed"] = df["eci_residualized"].to_numpy() < ECI_COLLAPSE_THRESHOLD
 
-    df_collapsed = df[df["collapsed"] == True]
-    df_normal = df[df["collapsed"] == False]
+    df_collapsed = df[df["collapsed"]]
+    df_normal = df[~df["collapsed"]]
 
     # Sample trajectories
     sample_collapsed = df_collapsed.sample(
@@ -163,13 +180,19 @@ def figure2_effective_rank_trajectories(
     # Create figure
     fig, axes = plt.subplots(1, 2, figsize=(10, 4), sharey=True)
 
-    # Plot collapsed trajectories
+    # Plot collapsed trajectories (one collection artist per group)
     ax = axes[0]
-    for idx, row in sample_collapsed.iterrows():
-        ranks = row["effective_ranks"]
-        if isinstance(ranks, list) and len(ranks) > 0:
-            x = np.arange(len(ranks))
-            ax.plot(x, ranks, color=COLORS["red"], alpha=0.3, linewidth=0.8)
+    segments = _trajectory_segments(sample_collapsed["effective_ranks"].tolist())
+    ax.add_collection(
+        LineCollection(
+            segments,
+            colors=COLORS["red"],
+            alpha=0.3,
+            linewidths=0.8,
+            rasterized=True,
+        )
+    )
+    ax.autoscale_view()
 
     ax.set_xlabel("Token window index")
     ax.set_ylabel("Effective rank")
@@ -181,11 +204,17 @@ def figure2_effective_rank_trajectories(
 
     # Plot normal trajectories
     ax = axes[1]
-    for idx, row in sample_normal.iterrows():
-        ranks = row["effective_ranks"]
-        if isinstance(ranks, list) and len(ranks) > 0:
-            x = np.arange(len(ranks))
-            ax.plot(x, ranks, color=COLORS["blue"], alpha=0.3, linewidth=0.8)
+    segments = _trajectory_segments(sample_normal["effective_ranks"].tolist())
+    ax.add_collection(
+        LineCollection(
+            segments,
+            colors=COLORS["blue"],
+            alpha=0.3,
+            linewidths=0.8,
+            rasterized=True,
+        )
+    )
+    ax.autoscale_view()
 
     ax.set_xlabel("Token window index")
     ax.set_title(
@@ -195,13 +224,22 @@ def figure2_effective_rank_trajectories(
     ax.spines["right"].set_visible(False)
 
     plt.tight_layout()
-    save_dpi = dpi if dpi is not None else DEFAULT_DPI
-    plt.savefig(output_path, dpi=save_dpi, bbox_inches="tight")
+    save_figure(output_path, dpi)
     plt.close()
 
     print(f"Figure 2 saved to {output_path}")
 
 
+def _trajectory_segments(trajectories: list) -> list:
+    """Turn per-sequence metric lists into (window index, value) line segments."""
+    # Skip missing (NaN/None) and empty cells
+    return [
+        np.column_stack([np.arange(len(values)), values])
+        for values in trajectories
+        if isinstance(values, (list, np.ndarray)) and len(values) > 0
+    ]
+
+
 def figure3_failure_prediction_panel(
     df: pd.DataFrame, output_path: Path, dpi: int = None
 ):
@@ -222,14 +260,15 @@ def figure3_failure_prediction_panel(
 
     # Prepare data
     y_true = df["qa_failure"].astype(int).values
-    y_score = -df["eci_residualized"].values  # Lower ECI → higher failure risk
-    y_prob = 1 / (
-        1 + np.exp(-(-df["eci_residualized"].values * 10))
-    )  # Sigmoid transform for calibration
+    # Lower ECI → higher failure risk
+    y_score = -df["eci_residualized"].to_numpy(dtype=np.float64)
+    y_prob = expit(10.0 * y_score)  # Sigmoid transform for calibration
 
     # Compute metrics
-    roc_auc, roc_lower, roc_upper = bootstrap_roc_auc(y_true, y_score)
-    pr_auc, pr_lower, pr_upper = bootstrap_pr_auc(y_true, y_score)
+    # ROC and PR bootstrap share one set of resamples
+    roc_result, pr_result = bootstrap_roc_pr_auc(y_true, y_score)
+    roc_auc, roc_lower, roc_upper = roc_result
+    pr_auc, pr_lower, pr_upper = pr_result
 
     fpr, tpr, _ = compute_roc_curve_data(y_true, y_score)
     precision, recall, _ = compute_pr_curve_data(y_true, y_score)
@@ -321,8 +360,7 @@ def figure3_failure_prediction_panel(
     ax3.set_ylim([-0.02, 1.02])
 
     plt.tight_layout()
-    save_dpi = dpi if dpi is not None else DEFAULT_DPI
-    plt.savefig(output_path, dpi=save_dpi, bbox_inches="tight")
+    save_figure(output_path, dpi)
     plt.close()
 
     print(f"Figure 3 saved to {output_path}")
@@ -331,7 +369,11 @@ def figure3_failure_prediction_panel(
 
 
 def generate_all_figures(
-    run_dir: Path, output_dir: Path, smoke: bool = False, dpi: int = None
+    run_dir: Path,
+    output_dir: Path,
+    smoke: bool = False,
+    dpi: int = None,
+    fmt: str = "png",
 ):
     """
     Generate all three figures from paper.
@@ -341,6 +383,7 @@ def generate_all_figures(
         output_dir: Directory to save figures
         smoke: If True, use subsampled data for fast smoke test
         dpi: DPI for output figures (default: 600)
+        fmt: Image format / file extension, e.g. 'png' or 'webp'
     """
     from .utils import (
         load_metrics_external,
@@ -367,16 +410,18 @@ def generate_all_figures(
     suffix = "_smoke" if smoke else ""
 
     print("\nGenerating Figure 1: ECI histograms...")
-    figure1_eci_histograms(df, output_dir / f"fig1_eci_histograms{suffix}.png", dpi=dpi)
+    figure1_eci_histograms(
+        df, output_dir / f"fig1_eci_histograms{suffix}.{fmt}", dpi=dpi
+    )
 
     print("\nGenerating Figure 2: Effective rank trajectories...")
     figure2_effective_rank_trajectories(
-        df, output_dir / f"fig2_effective_rank_trajectories{suffix}.png", dpi=dpi
+        df, output_dir / f"fig2_effective_rank_trajectories{suffix}.{fmt}", dpi=dpi
     )
 
     print("\nGenerating Figure 3: Failure prediction panel...")
     figure3_failure_prediction_panel(
-        df, output_dir / f"fig3_failure_prediction_panel{suffix}.png", dpi=dpi
+        df, output_dir / f"fig3_failure_prediction_panel{suffix}.{fmt}", dpi=dpi
     )
 
     print(f"\nAll figures saved to {output_dir}")
@@ -5,11 +5,13 @@ These metrics are computed from generated text and measure
 observable behavioral properties.
 """
 
-from collections import Counter
-from typing import Set
+from typing import List
 
 import numpy as np
 
+from ._jit import kernels
+from .ngram_fast import count_common, intern_tokens, ngram_hashes
+
 
 def compute_delta_i_drift(text1: str, text2: str, n: int = 3) -> float:
     """
@@ -25,22 +27,18 @@ def compute_delta_i_drift(text1: str, text2: str, n: int = 3) -> float:
     Returns:
         ΔI drift value [0, 1]
     """
-
-    def get_ngrams(text: str, n: int) -> Set[str]:
-        tokens = text.split()
-        return set(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
-
-    ngrams1 = get_ngrams(text1, n)
-    ngrams2 = get_ngrams(text2, n)
-
-    if not ngrams1 or not ngrams2:
+    # Shared vocabulary so equal tokens get equal ids across both texts
+    vocab = {}
+    ids1 = intern_tokens(text1.split(), vocab)
+    ids2 = intern_tokens(text2.split(), vocab)
+    ngrams1 = np.unique(ngram_hashes(ids1, n, len(vocab)))
+    ngrams2 = np.unique(ngram_hashes(ids2, n, len(vocab)))
+
+    if len(ngrams1) == 0 or len(ngrams2) == 0:
         return 1.0
 
-    intersection = len(ngrams1 & ngrams2)
-    union = len(ngrams1 | ngrams2)
-
-    if union == 0:
-        return 0.0
+    intersection = count_common(ngrams1, ngrams2)
+    union = len(ngrams1) + len(ngrams2) - intersection
 
     return 1.0 - (intersection / union)
 
@@ -58,13 +56,13 @@ def compute_ngram_novelty(text: str, n: int = 3) -> float:
     Returns:
         Novelty value [0, 1]
     """
-    tokens = text.split()
-    ngrams = [" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1)]
+    vocab = {}
+    ngrams = ngram_hashes(intern_tokens(text.split(), vocab), n, len(vocab))
 
-    if not ngrams:
+    if len(ngrams) == 0:
         return 0.0
 
-    unique = len(set(ngrams))
+    unique = len(np.unique(ngrams))
     total = len(ngrams)
 
     return unique / total
@@ -86,18 +84,70 @@ def compute_char_entropy(text: str) -> float:
         return 0.0
 
     # Count character frequencies
-    counts = Counter(text)
-    total = len(text)
+    if text.isascii():
+        # One byte per character: a fixed-size histogram in C
+        counts = np.bincount(
+            np.frombuffer(text.encode("ascii"), dtype=np.uint8), minlength=128
+        )
+    else:
+        # Fixed-width code points; surrogatepass keeps lone surrogates countable
+        codepoints = np.frombuffer(
+            text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32
+        )
+        _, counts = np.unique(codepoints, return_counts=True)
 
     # Compute probabilities
-    probs = np.array([count / total for count in counts.values()])
+    probs = counts / len(text)
 
-    # Shannon entropy
-    entropy = -np.sum(probs * np.log2(probs))
+    from scipy.special import xlogy
+
+    # Shannon entropy; xlogy(0, 0) = 0 covers characters absent from the text
+    entropy = -xlogy(probs, probs).sum() / np.log(2)
 
     return float(entropy)
 
 
+def compute_char_entropy_batch(texts: List[str]) -> np.ndarray:
+    """
+    Compute character-level Shannon entropy for many texts at once.
+
+    ASCII texts are concatenated and histogrammed with a single bincount
+    into an (n_texts, 128) count matrix; other texts fall back to
+    compute_char_entropy.
+
+    Args:
+        texts: Input texts
+
+    Returns:
+        Array of character entropies (bits), 0.0 for empty texts
+    """
+    entropies = np.zeros(len(texts))
+
+    ascii_rows = []
+    for i, text in enumerate(texts):
+        if text.isascii():
+            ascii_rows.append(i)
+        else:
+            entropies[i] = compute_char_entropy(text)
+
+    if ascii_rows:
+        encoded = [texts[i].encode("ascii") for i in ascii_rows]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        chars = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        # Offset each text's byte codes into its own row of 128 buckets
+        rows = np.repeat(np.arange(len(encoded)) * 128, lengths)
+        counts = np.bincount(rows + chars, minlength=len(encoded) * 128)
+        counts = counts.reshape(len(encoded), 128)
+
+        probs = counts / np.maximum(lengths, 1)[:, None]
+        from scipy.special import xlogy
+
+        entropies[ascii_rows] = -xlogy(probs, probs).sum(axis=1) / np.log(2)
+
+    return entropies
+
+
 def detect_repetition(text: str, window_size: int = 50, threshold: float = 0.8) -> bool:
     """
     Detect excessive repetition in text.
@@ -112,20 +162,84 @@ def detect_repetition(text: str, window_size: int = 50, threshold: float = 0.8)
     """
     tokens = text.split()
 
-    if len(tokens) < window_size * 2:
+    if window_size <= 0 or len(tokens) < window_size * 2:
         return False
 
-    # Compare consecutive windows
-    for i in range(len(tokens) - window_size * 2):
-        window1 = set(tokens[i : i + window_size])
-        window2 = set(tokens[i + window_size : i + window_size * 2])
+    vocab = {}
+    token_ids = intern_tokens(tokens, vocab)
+    jit = kernels()
+    has_repeated_window = (
+        _has_repeated_window if jit is None else jit.has_repeated_window
+    )
+    return bool(has_repeated_window(token_ids, len(vocab), window_size, threshold))
 
-        if not window1 or not window2:
-            continue
 
-        overlap = len(window1 & window2) / len(window1 | window2)
+def _has_repeated_window(token_ids, vocab_size, window_size, threshold):
+    """
+    Slide two adjacent windows over token ids, tracking their set overlap.
 
-        if overlap > threshold:
+    Per-token counts in each window are updated incrementally, and the sizes
+    of the distinct-token intersection and union change only when a count
+    crosses zero, so each shift costs O(1) instead of rebuilding two sets.
+    """
+    counts1 = np.zeros(vocab_size, dtype=np.int64)
+    counts2 = np.zeros(vocab_size, dtype=np.int64)
+    intersection = 0
+    union = 0
+
+    # Fill window1 = tokens[0:w], then window2 = tokens[w:2w]
+    for k in range(2 * window_size):
+        t = token_ids[k]
+        if k < window_size:
+            if counts1[t] == 0:
+                if counts2[t] > 0:
+                    intersection += 1
+                else:
+                    union += 1
+            counts1[t] += 1
+        else:
+            if counts2[t] == 0:
+                if counts1[t] > 0:
+                    intersection += 1
+                else:
+                    union += 1
+            counts2[t] += 1
+
+    for i in range(len(token_ids) - 2 * window_size):
+        if i > 0:
+            # Shift by one: tokens[i - 1] leaves window1, tokens[i + w - 1]
+            # moves from window2 to window1, tokens[i + 2w - 1] enters window2
+            leaving = token_ids[i - 1]
+            counts1[leaving] -= 1
+            if counts1[leaving] == 0:
+                if counts2[leaving] > 0:
+                    intersection -= 1
+                else:
+                    union -= 1
+
+            moving = token_ids[i + window_size - 1]
+            counts2[moving] -= 1
+            if counts2[moving] == 0:
+                if counts1[moving] > 0:
+                    intersection -= 1
+                else:
+                    union -= 1
+            if counts1[moving] == 0:
+                if counts2[moving] > 0:
+                    intersection += 1
+                else:
+                    union += 1
+            counts1[moving] += 1
+
+            entering = token_ids[i + 2 * window_size - 1]
+            if counts2[entering] == 0:
+                if counts1[entering] > 0:
+                    intersection += 1
+                else:
+                    union += 1
+            counts2[entering] += 1
+
+        if intersection / union > threshold:
             return True
 
     return False
@@ -6,14 +6,152 @@ internal representational structure.
 """
 
 import logging
-from typing import List
+import threading
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+from ._jit import kernels
+
 # FIX: Add logging for numerical stability warnings
 logger = logging.getLogger(__name__)
 
 
+class InternalMetrics:
+    """
+    Rank metrics over windows of singular values, reusing scratch buffers.
+
+    Computing effective rank and participation ratio window by window with
+    NumPy allocates several small temporaries per call. An instance keeps
+    float64 scratch arrays sized to the largest window seen and evaluates
+    every step in place with out= arguments. With numba installed, the
+    allocation-free scalar kernels are used instead.
+
+    The buffers make an instance unsafe to share between threads; the
+    module-level compute_* functions use one instance per thread.
+
+    Args:
+        max_k: Initial buffer size (number of singular values per window);
+            buffers grow on demand
+    """
+
+    def __init__(self, max_k: int = 256):
+        self._s_squared = np.empty(max_k)
+        self._p = np.empty(max_k)
+
+    def effective_rank(self, singular_values: np.ndarray) -> float:
+        """Effective rank, as compute_effective_rank."""
+        if len(singular_values) == 0:
+            return 0.0
+
+        jit = kernels()
+        if jit is not None:
+            sv = np.ascontiguousarray(singular_values, dtype=np.float64)
+            s2_sum, _ = jit.spectral_sums(sv)
+            return float(jit.effective_rank(sv, s2_sum))
+
+        s_squared, s2_sum, _ = self._spectral_sums(singular_values)
+        return self._effective_rank(s_squared, s2_sum)
+
+    def participation_ratio(self, singular_values: np.ndarray) -> Optional[float]:
+        """Participation ratio, as compute_participation_ratio."""
+        if len(singular_values) == 0:
+            return 0.0
+
+        jit = kernels()
+        if jit is not None:
+            sv = np.ascontiguousarray(singular_values, dtype=np.float64)
+            s2_sum, s4_sum = jit.spectral_sums(sv)
+        else:
+            _, s2_sum, s4_sum = self._spectral_sums(singular_values)
+
+        return _participation_ratio_from_sums(s2_sum, s4_sum, np.shape(singular_values))
+
+    def rank_metrics(
+        self, singular_values: np.ndarray
+    ) -> Tuple[float, Optional[float]]:
+        """Effective rank and participation ratio, as compute_rank_metrics."""
+        if len(singular_values) == 0:
+            return 0.0, 0.0
+
+        jit = kernels()
+        if jit is not None:
+            sv = np.ascontiguousarray(singular_values, dtype=np.float64)
+            s2_sum, s4_sum = jit.spectral_sums(sv)
+            erank = float(jit.effective_rank(sv, s2_sum))
+        else:
+            s_squared, s2_sum, s4_sum = self._spectral_sums(singular_values)
+            erank = self._effective_rank(s_squared, s2_sum)
+
+        shape = np.shape(singular_values)
+        return erank, _participation_ratio_from_sums(s2_sum, s4_sum, shape)
+
+    def _spectral_sums(
+        self, singular_values: np.ndarray
+    ) -> Tuple[np.ndarray, float, float]:
+        """s² (a view into the scratch buffer), sum(s²) and sum(s⁴)."""
+        k = len(singular_values)
+        if k > len(self._s_squared):
+            self._s_squared = np.empty(k)
+            self._p = np.empty(k)
+
+        s_squared = self._s_squared[:k]
+        np.multiply(singular_values, singular_values, out=s_squared)
+        return s_squared, s_squared.sum(), np.dot(s_squared, s_squared)
+
+    def _effective_rank(self, s_squared: np.ndarray, s2_sum: float) -> float:
+        # No usable weights (all zero, or non-finite): every p is NaN and
+        # drops out of the entropy, which leaves H = 0
+        if not (np.isfinite(s2_sum) and s2_sum > 0):
+            return 1.0
+
+        # Normalize to probability distribution
+        p = self._p[: len(s_squared)]
+        np.divide(s_squared, s2_sum, out=p)
+
+        from scipy.special import xlogy
+
+        # Shannon entropy; xlogy(0, 0) = 0, so zero weights need no masking
+        H = -xlogy(p, p, out=p).sum()
+
+        # Effective rank
+        return float(np.exp(H))
+
+
+_thread_local = threading.local()
+
+
+def _default_metrics() -> InternalMetrics:
+    """InternalMetrics instance owned by the calling thread."""
+    metrics = getattr(_thread_local, "metrics", None)
+    if metrics is None:
+        metrics = _thread_local.metrics = InternalMetrics()
+    return metrics
+
+
+def _participation_ratio_from_sums(
+    s2_sum: float, s4_sum: float, shape: Tuple[int, ...]
+) -> Optional[float]:
+    numerator = s2_sum**2
+    denominator = s4_sum
+
+    if denominator == 0:
+        return 0.0
+
+    # FIX: Add numerical stability guard for inf/nan values
+    pr = numerator / denominator
+
+    if not np.isfinite(pr):
+        logger.warning(
+            f"Participation ratio computation produced non-finite value: {pr}. "
+            f"Returning None. Singular values shape: {shape}, "
+            f"numerator: {numerator}, denominator: {denominator}"
+        )
+        return None  # FIX: Return None for non-finite values (will be stored as empty in CSV)
+
+    return float(pr)
+
+
 def compute_effective_rank(singular_values: np.ndarray) -> float:
     """
     Compute effective rank from singular values.
@@ -27,21 +165,7 @@ def compute_effective_rank(singular_values: np.ndarray) -> float:
     Returns:
         Effective rank (float)
     """
-    if len(singular_values) == 0:
-        return 0.0
-
-    # Normalize to probability distribution
-    s_squared = singular_values**2
-    p = s_squared / s_squared.sum()
-
-    # Avoid log(0)
-    p = p[p > 0]
-
-    # Shannon entropy
-    H = -np.sum(p * np.log(p))
-
-    # Effective rank
-    return float(np.exp(H))
+    return _default_metrics().effective_rank(singular_values)
 
 
 def compute_participation_ratio(singular_values: np.ndarray) -> float:
@@ -56,28 +180,77 @@ def compute_participation_ratio(singular_values: np.ndarray) -> float:
     Returns:
         Participation ratio (float), or None if computation produces inf/nan
     """
-    if len(singular_values) == 0:
-        return 0.0
+    return _default_metrics().participation_ratio(singular_values)
 
-    s_squared = singular_values**2
-    numerator = s_squared.sum() ** 2
-    denominator = (s_squared**2).sum()
 
-    if denominator == 0:
-        return 0.0
+def compute_rank_metrics(
+    singular_values: np.ndarray,
+) -> Tuple[float, Optional[float]]:
+    """
+    Compute effective rank and participation ratio from one set of sums.
 
-    # FIX: Add numerical stability guard for inf/nan values
-    pr = numerator / denominator
+    Equivalent to calling compute_effective_rank and
+    compute_participation_ratio, but squares the singular values once.
+    Prefer this when both metrics are needed for the same window.
 
-    if not np.isfinite(pr):
-        logger.warning(
-            f"Participation ratio computation produced non-finite value: {pr}. "
-            f"Returning None. Singular values shape: {singular_values.shape}, "
-            f"numerator: {numerator}, denominator: {denominator}"
-        )
-        return None  # FIX: Return None for non-finite values (will be stored as empty in CSV)
+    Args:
+        singular_values: Array of singular values from SVD
 
-    return float(pr)
+    Returns:
+        Tuple of (effective rank, participation ratio or None)
+    """
+    return _default_metrics().rank_metrics(singular_values)
+
+
+def compute_effective_rank_batch(singular_values: np.ndarray) -> np.ndarray:
+    """
+    Compute effective rank for many windows at once.
+
+    Row-wise equivalent of compute_effective_rank. Rows with fewer singular
+    values can be zero-padded, since zeros do not change either metric.
+
+    Args:
+        singular_values: Array of shape (n_windows, k)
+
+    Returns:
+        Effective ranks, shape (n_windows,)
+    """
+    S = np.asarray(singular_values, dtype=np.float64)
+    if S.shape[1] == 0:
+        return np.zeros(S.shape[0])
+
+    S2 = S * S
+    with np.errstate(divide="ignore", invalid="ignore"):
+        P = S2 / S2.sum(axis=1, keepdims=True)
+
+    # log(1) = 0, so masked entries drop out of the entropy like p[p > 0] does
+    P = np.where(P > 0, P, 1.0)
+    H = -(P * np.log(P)).sum(axis=1)
+    return np.exp(H)
+
+
+def compute_participation_ratio_batch(singular_values: np.ndarray) -> np.ndarray:
+    """
+    Compute participation ratio for many windows at once.
+
+    Row-wise equivalent of compute_participation_ratio, except that rows
+    whose ratio is non-finite come back as NaN rather than None.
+
+    Args:
+        singular_values: Array of shape (n_windows, k)
+
+    Returns:
+        Participation ratios, shape (n_windows,)
+    """
+    S = np.asarray(singular_values, dtype=np.float64)
+    S2 = S * S
+    numerator = S2.sum(axis=1) ** 2
+    denominator = np.einsum("ij,ij->i", S2, S2)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        pr = np.where(denominator > 0, numerator / denominator, 0.0)
+    pr[~np.isfinite(pr)] = np.nan
+    return pr
 
 
 def compute_variance(hidden_states: np.ndarray) -> float:
@@ -106,10 +279,16 @@ def aggregate_trajectory(values: List[float]) -> dict:
     if not values or len(values) == 0:
         return {"mean": 0.0, "std": 0.0, "min": 0.0, "max": 0.0}
 
-    arr = np.array(values)
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    jit = kernels()
+    if jit is not None:
+        mean, std, lo, hi = jit.aggregate(arr)
+    else:
+        mean, std, lo, hi = np.mean(arr), np.std(arr), np.min(arr), np.max(arr)
+
     return {
-        "mean": float(np.mean(arr)),
-        "std": float(np.std(arr)),
-        "min": float(np.min(arr)),
-        "max": float(np.max(arr)),
+        "mean": float(mean),
+        "std": float(std),
+        "min": float(lo),
+        "max": float(hi),
     }
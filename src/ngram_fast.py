@@ -0,0 +1,97 @@
+"""
+Integer n-gram hashing for the external text metrics.
+
+Tokens are interned to small integer ids once, and each n-gram is reduced
+to a 64-bit polynomial key, so n-gram sets become int arrays instead of
+sets of joined strings. When the vocabulary size is known and
+vocab_size ** n fits in 64 bits, the key is the n-gram read as a base
+vocab_size number and is therefore exact; otherwise it is a hash. Kernels
+are compiled with numba when available; otherwise equivalent NumPy code
+is used and gives identical keys.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ._jit import kernels
+
+# Multiplier of the polynomial n-gram hash (64-bit FNV prime)
+HASH_PRIME = np.uint64(1099511628211)
+
+
+def intern_tokens(tokens: List[str], vocab: Dict[str, int]) -> np.ndarray:
+    """
+    Map tokens to integer ids, adding unseen tokens to the vocabulary.
+
+    Args:
+        tokens: Token strings
+        vocab: Token -> id mapping, shared by all texts that are compared
+
+    Returns:
+        int64 array of token ids
+    """
+    return np.fromiter(
+        (vocab.setdefault(token, len(vocab)) for token in tokens),
+        dtype=np.int64,
+        count=len(tokens),
+    )
+
+
+def ngram_hashes(
+    token_ids: np.ndarray, n: int, vocab_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Hash every n-gram of a token id sequence.
+
+    h = sum(t[i + k] * m ** (n - 1 - k)) mod 2**64
+
+    where m is vocab_size if vocab_size ** n <= 2**64, making h an exact,
+    collision-free key, and HASH_PRIME otherwise.
+
+    Args:
+        token_ids: int64 token ids (see intern_tokens)
+        n: N-gram size
+        vocab_size: Number of distinct ids (len of the interning vocab), if
+            known. Keys are only comparable between sequences hashed with
+            the same vocab_size.
+
+    Returns:
+        uint64 array with one hash per n-gram, in text order
+    """
+    if len(token_ids) < n:
+        return np.empty(0, dtype=np.uint64)
+
+    if vocab_size is not None and vocab_size**n <= 2**64:
+        multiplier = np.uint64(vocab_size)
+    else:
+        multiplier = HASH_PRIME
+
+    jit = kernels()
+    if jit is not None:
+        return jit.ngram_hashes(token_ids, n, multiplier)
+
+    # Horner's rule over the n shifted views; uint64 arithmetic wraps mod 2**64
+    ids = token_ids.astype(np.uint64)
+    n_ngrams = len(ids) - n + 1
+    hashes = np.zeros(n_ngrams, dtype=np.uint64)
+    for k in range(n):
+        hashes = hashes * multiplier + ids[k : k + n_ngrams]
+    return hashes
+
+
+def count_common(a: np.ndarray, b: np.ndarray) -> int:
+    """
+    Count the values two sorted, duplicate-free arrays have in common.
+
+    Args:
+        a: Sorted unique values (e.g., np.unique of n-gram hashes)
+        b: Sorted unique values
+
+    Returns:
+        Size of the intersection
+    """
+    jit = kernels()
+    if jit is not None:
+        return int(jit.count_common(a, b))
+    return len(np.intersect1d(a, b, assume_unique=True))
@@ -1,15 +1,46 @@
 """
 Utility functions for data loading and validation.
+
+pandas is imported inside the functions that need it, so importing this
+module stays cheap for entry points that only touch the lightweight helpers.
 """
 
+from __future__ import annotations
+
 import ast
 import json
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .constants import (
+    EXTERNAL_COLS_REQUIRED,
+    EXTERNAL_DICT_COLS,
+    EXTERNAL_LIST_COLS,
+    INTERNAL_COLS_REQUIRED,
+    INTERNAL_LIST_COLS,
+    MERGE_KEYS,
+)
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
-from .constants import EXTERNAL_COLS_REQUIRED, INTERNAL_COLS_REQUIRED
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# JSON literals that are not Python literals. List cells containing any of
+# them skip the JSON fast path and go to literal_eval, which rejects them, so
+# parsing never depends on the JSON backend (orjson rejects NaN, json does not)
+# and JSON null/true/false never turn into None/True/False.
+_JSON_ONLY_TOKENS = ("NaN", "Infinity", "null", "true", "false")
+
+# DataFrame.attrs key (persisted in the Parquet metadata) naming the CSV a
+# cache sidecar was parsed from
+_CACHE_SOURCE_ATTR = "source_csv"
 
 
 def load_manifest(run_dir: Path) -> Dict[str, Any]:
@@ -48,7 +79,11 @@ def load_metrics_internal(run_dir: Path) -> pd.DataFrame:
             "This file should contain internal model metrics."
         )
 
-    df = pd.read_csv(csv_path)
+    cached = _read_parquet_cache(csv_path, INTERNAL_COLS_REQUIRED, INTERNAL_LIST_COLS)
+    if cached is not None:
+        return cached
+
+    df = _read_csv(csv_path)
 
     # Validate required columns
     missing = set(INTERNAL_COLS_REQUIRED) - set(df.columns)
@@ -59,17 +94,11 @@ def load_metrics_internal(run_dir: Path) -> pd.DataFrame:
         )
 
     # Parse list columns stored as strings
-    list_cols = [
-        "effective_ranks",
-        "participation_ratios",
-        "variances",
-        "window_starts",
-        "window_ends",
-    ]
-    for col in list_cols:
+    for col in INTERNAL_LIST_COLS:
         if col in df.columns:
-            df[col] = df[col].apply(safe_parse_list)
+            df[col] = parse_list_column(df[col])
 
+    _write_parquet_cache(df, csv_path, INTERNAL_LIST_COLS)
     return df
 
 
@@ -93,7 +122,13 @@ def load_metrics_external(run_dir: Path) -> pd.DataFrame:
             "This file should contain external behavioral metrics."
         )
 
-    df = pd.read_csv(csv_path)
+    cached = _read_parquet_cache(
+        csv_path, EXTERNAL_COLS_REQUIRED, EXTERNAL_LIST_COLS, EXTERNAL_DICT_COLS
+    )
+    if cached is not None:
+        return cached
+
+    df = _read_csv(csv_path, bool_cols=["qa_failure"])
 
     # Validate required columns
     missing = set(EXTERNAL_COLS_REQUIRED) - set(df.columns)
@@ -104,42 +139,188 @@ def load_metrics_external(run_dir: Path) -> pd.DataFrame:
         )
 
     # Parse list/dict columns
-    list_cols = ["delta_i_values", "ngram_novelty_values", "char_entropy_values"]
-    for col in list_cols:
+    for col in EXTERNAL_LIST_COLS:
         if col in df.columns:
-            df[col] = df[col].apply(safe_parse_list)
+            df[col] = parse_list_column(df[col])
 
-    if "reasoning_failures" in df.columns:
-        df["reasoning_failures"] = df["reasoning_failures"].apply(safe_parse_dict)
+    for col in EXTERNAL_DICT_COLS:
+        if col in df.columns:
+            df[col] = parse_dict_column(df[col])
 
     # Ensure qa_failure is boolean
     df["qa_failure"] = df["qa_failure"].astype(bool)
 
+    _write_parquet_cache(df, csv_path, EXTERNAL_LIST_COLS, EXTERNAL_DICT_COLS)
     return df
 
 
+def _read_csv(csv_path: Path, bool_cols: List[str] = ()) -> pd.DataFrame:
+    """
+    Read a metrics CSV with the multithreaded pyarrow engine when possible.
+
+    Falls back to pandas' default C engine if pyarrow is not installed, or if
+    a column in bool_cols was not read as bool: pyarrow turns missing values
+    into None, whereas the loaders' astype(bool) expects the C engine's NaN.
+
+    pyarrow parses floats exactly, like float_precision="round_trip"; the C
+    engine's default parser can be off by an ulp, so loaded values may differ
+    from a plain pd.read_csv in the last bit.
+    """
+    import pandas as pd
+
+    try:
+        df = pd.read_csv(csv_path, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(csv_path)
+
+    if any(col in df.columns and df[col].dtype != bool for col in bool_cols):
+        return pd.read_csv(csv_path)
+    return df
+
+
+def _parquet_cache_path(csv_path: Path) -> Path:
+    """Parquet sidecar holding the parsed contents of a metrics CSV."""
+    return csv_path.with_suffix(".parquet")
+
+
+def _read_parquet_cache(
+    csv_path: Path,
+    required_cols: List[str],
+    list_cols: List[str],
+    dict_cols: List[str] = (),
+) -> Optional[pd.DataFrame]:
+    """
+    Load the parsed metrics from the Parquet sidecar, if it is usable.
+
+    The sidecar is used only when it was written from a CSV of exactly the
+    current size and modification time (recorded in its metadata) and still
+    has every required column. List cells are restored to plain Python lists
+    and dict cells, stored as JSON strings, to plain dicts; the writer only
+    keeps a sidecar whose cells come back exactly as the CSV parsers
+    returned them.
+
+    Returns:
+        Parsed DataFrame, or None if the CSV has to be parsed
+    """
+    import pandas as pd
+
+    cache_path = _parquet_cache_path(csv_path)
+    if not cache_path.exists():
+        return None
+
+    try:
+        df = pd.read_parquet(cache_path)
+    except (ImportError, OSError, ValueError):
+        return None
+
+    # An exact match, not "newer than": copies made with cp -p, rsync -a or
+    # tar keep older mtimes, so a replaced CSV can predate a stale sidecar
+    if df.attrs.pop(_CACHE_SOURCE_ATTR, None) != _csv_signature(csv_path):
+        return None
+
+    if set(required_cols) - set(df.columns):
+        return None
+
+    for col in list_cols:
+        if col in df.columns:
+            df[col] = [v.tolist() if v is not None else [] for v in df[col]]
+    for col in dict_cols:
+        if col in df.columns:
+            # Sidecars from before dicts were stored as JSON hold lossy structs
+            if not pd.api.types.is_string_dtype(df[col]):
+                return None
+            try:
+                df[col] = [_json_loads(v) for v in df[col]]
+            except ValueError:
+                return None
+
+    return df
+
+
+def _csv_signature(csv_path: Path) -> Dict[str, int]:
+    """Size and modification time identifying the CSV a sidecar was built from."""
+    stat = csv_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _write_parquet_cache(
+    df: pd.DataFrame,
+    csv_path: Path,
+    list_cols: List[str],
+    dict_cols: List[str] = (),
+):
+    """
+    Write parsed metrics next to the CSV so later loads skip parsing.
+
+    The CSV's size and modification time are stored in the sidecar's
+    metadata, and _read_parquet_cache requires both to match exactly.
+
+    Dict cells are stored as JSON strings, since Parquet structs fill keys
+    missing from a row with nulls and widen mixed int/float fields. The
+    written sidecar is read back once and deleted unless every list and dict
+    cell round-trips exactly (same values and types, e.g. 3 vs 3.0).
+
+    Best effort: without a Parquet engine, or in a read-only run directory,
+    the cache is simply not written.
+    """
+    cache_path = _parquet_cache_path(csv_path)
+    try:
+        encoded = {c: [json.dumps(v) for v in df[c]] for c in dict_cols if c in df}
+        cached = df.assign(**encoded)
+        cached.attrs[_CACHE_SOURCE_ATTR] = _csv_signature(csv_path)
+        cached.to_parquet(cache_path, index=False)
+    except (ImportError, OSError, ValueError, TypeError):
+        return
+
+    restored = _read_parquet_cache(csv_path, list(df.columns), list_cols, dict_cols)
+    if restored is None or not all(
+        list(map(repr, df[c])) == list(map(repr, restored[c]))
+        for c in chain(list_cols, dict_cols)
+        if c in df
+    ):
+        cache_path.unlink(missing_ok=True)
+
+
 def safe_parse_list(val: Any) -> List:
     """Safely parse a string representation of a list."""
-    if pd.isna(val) or val == "":
-        return []
+    # Missing cells (None, NaN) and empty strings fall through to []
     if isinstance(val, (list, tuple)):
         return list(val)
-    if isinstance(val, str):
-        try:
-            parsed = ast.literal_eval(val)
-            return list(parsed) if isinstance(parsed, (list, tuple)) else []
-        except (ValueError, SyntaxError):
-            return []
+    if isinstance(val, str) and val:
+        # Stored lists of numbers are valid JSON, which parses far faster than
+        # a Python literal; literal_eval remains the fallback (tuples, True, ...)
+        parsed = _json_list(val)
+        if parsed is None:
+            try:
+                parsed = ast.literal_eval(val)
+            except (ValueError, SyntaxError):
+                return []
+        return list(parsed) if isinstance(parsed, (list, tuple)) else []
     return []
 
 
+def _json_list(val: str) -> Optional[List]:
+    """
+    Parse a JSON array that is also a valid Python literal.
+
+    Returns:
+        The parsed list, or None if val is not such an array (use literal_eval)
+    """
+    if any(token in val for token in _JSON_ONLY_TOKENS):
+        return None
+    try:
+        parsed = _json_loads(val)
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, list) else None
+
+
 def safe_parse_dict(val: Any) -> Dict:
     """Safely parse a string representation of a dict."""
-    if pd.isna(val) or val == "":
-        return {}
+    # Missing cells (None, NaN) and empty strings fall through to {}
     if isinstance(val, dict):
         return val
-    if isinstance(val, str):
+    if isinstance(val, str) and val:
         try:
             parsed = ast.literal_eval(val)
             return parsed if isinstance(parsed, dict) else {}
@@ -148,12 +329,112 @@ def safe_parse_dict(val: Any) -> Dict:
     return {}
 
 
+def parse_list_column(col: pd.Series) -> pd.Series:
+    """
+    Parse a column of stringified lists, choosing the parser once per column.
+
+    A column made only of strings is parsed with a straight JSON pass; any
+    cell that is not a plain JSON list (empty, NaN, a Python literal, ...) sends
+    the whole column back through safe_parse_list, so results always match
+    applying safe_parse_list cell by cell.
+
+    Args:
+        col: Column as read from the CSV
+
+    Returns:
+        Series of lists with the same index and name
+    """
+    import pandas as pd
+
+    values = col.to_numpy()
+    parsed = None
+    if _is_str_column(col):
+        parsed = [_json_list(v) for v in values]
+        if any(v is None for v in parsed):
+            parsed = None
+
+    if parsed is None:
+        parsed = [safe_parse_list(v) for v in values]
+    return pd.Series(parsed, index=col.index, name=col.name, dtype=object)
+
+
+def parse_dict_column(col: pd.Series) -> pd.Series:
+    """
+    Parse a column of stringified dicts, choosing the parser once per column.
+
+    Dict counterpart of parse_list_column: all-string columns are evaluated
+    directly, anything else falls back to safe_parse_dict cell by cell.
+
+    Args:
+        col: Column as read from the CSV
+
+    Returns:
+        Series of dicts with the same index and name
+    """
+    import pandas as pd
+
+    values = col.to_numpy()
+    parsed = None
+    if _is_str_column(col):
+        try:
+            parsed = [ast.literal_eval(v) for v in values]
+        except (ValueError, SyntaxError):
+            parsed = None
+        if parsed is not None and not all(isinstance(v, dict) for v in parsed):
+            parsed = None
+
+    if parsed is None:
+        parsed = [safe_parse_dict(v) for v in values]
+    return pd.Series(parsed, index=col.index, name=col.name, dtype=object)
+
+
+def _is_str_column(col: pd.Series) -> bool:
+    """Whether every cell of the column is a string (no NaN, lists, ...)."""
+    import pandas as pd
+
+    return pd.api.types.is_string_dtype(col) and not col.isna().any()
+
+
+def materialize_flat(df: pd.DataFrame, col: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten a list-valued column into one contiguous buffer plus row offsets.
+
+    Row i's values are values[offsets[i] : offsets[i + 1]], a view rather
+    than a copy, so cohort-wide statistics (mean, percentiles, ...) run as a
+    single NumPy operation over ``values``.
+
+    Args:
+        df: DataFrame with a parsed list column (e.g., 'effective_ranks')
+        col: Column name
+
+    Returns:
+        Tuple of (values as float64, offsets as int64 of length len(df) + 1)
+    """
+    cells = df[col].tolist()
+    lengths = np.fromiter(map(len, cells), dtype=np.int64, count=len(cells))
+
+    offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    values = np.fromiter(
+        chain.from_iterable(cells), dtype=np.float64, count=offsets[-1]
+    )
+
+    return values, offsets
+
+
 def merge_metrics(df_internal: pd.DataFrame, df_external: pd.DataFrame) -> pd.DataFrame:
     """Merge internal and external metrics on prompt_id and model_name."""
+    import pandas as pd
+
+    if _keys_aligned(df_internal, df_external):
+        # Paired CSVs: row i of both files is the same sequence, no join needed
+        return merge_metrics_aligned(df_internal, df_external)
+
     merged = pd.merge(
         df_internal,
         df_external,
-        on=["prompt_id", "model_name"],
+        on=MERGE_KEYS,
         how="inner",
         suffixes=("", "_external"),
     )
@@ -167,10 +448,58 @@ def merge_metrics(df_internal: pd.DataFrame, df_external: pd.DataFrame) -> pd.Da
     return merged
 
 
+def merge_metrics_aligned(
+    df_internal: pd.DataFrame, df_external: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Merge row-aligned internal and external metrics by column concatenation.
+
+    Gives the same result as merge_metrics when both frames list the same
+    unique (prompt_id, model_name) keys in the same order, which is how the
+    run scripts write them. Alignment is not checked.
+
+    Args:
+        df_internal: Internal metrics DataFrame
+        df_external: External metrics DataFrame, row-aligned with df_internal
+
+    Returns:
+        Merged DataFrame; overlapping external columns get an '_external' suffix
+    """
+    import pandas as pd
+
+    external = df_external.drop(columns=MERGE_KEYS)
+    overlap = external.columns.intersection(df_internal.columns)
+    external = external.rename(columns={c: f"{c}_external" for c in overlap})
+
+    return pd.concat(
+        [
+            df_internal.reset_index(drop=True),
+            external.reset_index(drop=True),
+        ],
+        axis=1,
+    )
+
+
+def _keys_aligned(df_internal: pd.DataFrame, df_external: pd.DataFrame) -> bool:
+    """Check that both frames list the same unique merge keys in the same order."""
+    if len(df_internal) != len(df_external) or len(df_internal) == 0:
+        return False
+
+    for key in MERGE_KEYS:
+        if not np.array_equal(df_internal[key].to_numpy(), df_external[key].to_numpy()):
+            return False
+
+    return not df_internal.duplicated(subset=MERGE_KEYS).any()
+
+
 def subsample_data(
     df: pd.DataFrame, frac: float = 0.05, min_rows: int = 30, seed: int = 42
 ) -> pd.DataFrame:
     """Subsample DataFrame for smoke tests."""
     n_target = max(int(len(df) * frac), min_rows)
     n_target = min(n_target, len(df))
-    return df.sample(n=n_target, random_state=seed).reset_index(drop=True)
+
+    # Draw row positions only; sorting keeps the take sequential and in file order
+    rng = np.random.default_rng(seed)
+    idx = np.sort(rng.choice(len(df), size=n_target, replace=False))
+    return df.iloc[idx].reset_index(drop=True)